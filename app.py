@@ -4,8 +4,9 @@ import argparse
 import sys
 import os
 from pathlib import Path
-from src.loaders import DocumentLoader
 from src.indexing import DocumentIndexer
+from src.manifest import load_manifest, manifest_path
+from src.pipeline import index_folder
 from src.retrieval import QARetriever
 from src.utils import load_env_file, validate_folder
 
@@ -29,31 +30,54 @@ Examples:
     parser.add_argument(
         "--reindex",
         action="store_true",
-        help="Force reindexing even if vector store exists",
+        help="Rebuild the index from scratch even if vector store exists",
     )
 
     parser.add_argument(
         "--chunk-size",
         type=int,
         default=1000,
-        help="Size of text chunks (default: 1000)",
+        help="Size of text chunks in tokens (default: 1000)",
     )
 
     parser.add_argument(
         "--chunk-overlap",
         type=int,
         default=200,
-        help="Overlap between chunks (default: 200)",
+        help="Overlap between chunks in tokens (default: 200)",
     )
 
     parser.add_argument(
         "--k", type=int, default=4, help="Number of documents to retrieve (default: 4)"
     )
 
+    parser.add_argument(
+        "--loader-workers",
+        type=int,
+        default=None,
+        help="Number of processes used to parse documents (default: CPU count - 1)",
+    )
+
+    parser.add_argument(
+        "--embed-backend",
+        choices=["openai", "local"],
+        default=None,
+        help="Embedding backend: OpenAI API or a local sentence-transformers "
+        "model (default: $EMBED_BACKEND or openai)",
+    )
+
+    parser.add_argument(
+        "--no-answer-cache",
+        action="store_true",
+        help="Don't reuse stored answers to similar questions (./qa_cache.db)",
+    )
+
     args = parser.parse_args()
+    answer_cache = None if args.no_answer_cache else "./qa_cache.db"
 
     # Load environment variables
     load_env_file()
+    embed_backend = args.embed_backend or os.getenv("EMBED_BACKEND", "openai")
 
     # Validate OpenAI API key is set
     if not os.getenv("OPENAI_API_KEY"):
@@ -72,44 +96,56 @@ Examples:
     print("=" * 60)
     print()
 
-    # Step 1: Load documents
-    print("Step 1: Loading documents...")
+    # Step 1: Load and index documents
+    print("Step 1: Loading and indexing documents...")
     try:
-        documents = DocumentLoader.load_folder(args.docs)
-        if not documents:
-            print("Error: No documents found in the specified folder.")
-            sys.exit(1)
+        indexer = DocumentIndexer(
+            chunk_size=args.chunk_size,
+            chunk_overlap=args.chunk_overlap,
+            embedding_backend=embed_backend,
+        )
     except Exception as e:
-        print(f"Error loading documents: {e}")
+        print(f"Error initializing embeddings: {e}")
         sys.exit(1)
 
-    # Step 2: Index documents
-    print("\nStep 2: Indexing documents...")
-    indexer = DocumentIndexer(
-        chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap
-    )
-
+    rebuilt = False
     try:
-        # Check if index exists
-        if not args.reindex and Path(indexer.persist_directory).exists():
+        # Reuse the existing index if it was built with the same settings
+        settings = load_manifest(manifest_path(indexer.persist_directory))["settings"]
+        if (
+            not args.reindex
+            and Path(indexer.persist_directory).exists()
+            and settings == indexer.index_settings
+        ):
             print("Found existing index. Loading...")
             vector_store = indexer.load_existing_index()
         else:
             print("Creating new index...")
-            vector_store = indexer.index_documents(documents)
+            vector_store = index_folder(
+                args.docs,
+                indexer,
+                loader_workers=args.loader_workers,
+                rebuild=args.reindex,
+            )
+            if vector_store is None:
+                print("Error: No documents found in the specified folder.")
+                sys.exit(1)
+            rebuilt = True
     except Exception as e:
         print(f"Error indexing documents: {e}")
         sys.exit(1)
 
-    # Step 3: Initialize QA retriever
-    print("\nStep 3: Initializing QA system...")
+    # Step 2: Initialize QA retriever
+    print("\nStep 2: Initializing QA system...")
     try:
-        qa_retriever = QARetriever(vector_store, k=args.k)
+        qa_retriever = QARetriever(vector_store, k=args.k, cache_path=answer_cache)
+        if rebuilt:
+            qa_retriever.clear_cache()
     except Exception as e:
         print(f"Error initializing QA system: {e}")
         sys.exit(1)
 
-    # Step 4: Interactive Q&A loop
+    # Step 3: Interactive Q&A loop
     print("\n" + "=" * 60)
     print("Ready! Ask questions about your documents.")
     print("Type 'quit' to exit.")
@@ -135,20 +171,22 @@ Examples:
                 print("=" * 60)
 
                 try:
-                    # Reload documents from folder
-                    print("\nStep 1: Reloading documents from folder...")
-                    documents = DocumentLoader.load_folder(args.docs)
-                    if not documents:
+                    # Reload and reindex documents from folder
+                    print("\nStep 1: Reloading and reindexing documents...")
+                    new_store = index_folder(
+                        args.docs, indexer, loader_workers=args.loader_workers
+                    )
+                    if new_store is None:
                         print("Warning: No documents found in the folder.")
                         continue
-
-                    # Reindex documents
-                    print("\nStep 2: Reindexing documents...")
-                    vector_store = indexer.index_documents(documents)
+                    vector_store = new_store
 
                     # Update QA retriever with new vector store
-                    print("\nStep 3: Updating QA system...")
-                    qa_retriever = QARetriever(vector_store, k=args.k)
+                    print("\nStep 2: Updating QA system...")
+                    qa_retriever = QARetriever(
+                        vector_store, k=args.k, cache_path=answer_cache
+                    )
+                    qa_retriever.clear_cache()
 
                     print("\n" + "=" * 60)
                     print("Reindexing complete! The database has been updated.")
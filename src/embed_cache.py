@@ -0,0 +1,377 @@
+"""Persistent on-disk cache for document embeddings."""
+
+from typing import Dict, List, Optional, Tuple
+from langchain_core.embeddings import Embeddings
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+import numpy as np
+
+try:
+    from datasketch import LeanMinHash, MinHash, MinHashLSH
+except ImportError:  # Near-duplicate matching is optional
+    LeanMinHash = MinHash = MinHashLSH = None
+
+# Maximum number of parameters bound into a single SELECT ... IN (...) query
+_LOOKUP_BATCH_SIZE = 500
+# Character shingle length used for near-duplicate detection
+SHINGLE_SIZE = 5
+# Permutations per MinHash signature
+NUM_PERM = 128
+
+
+def _minhash(text: str) -> "LeanMinHash":
+    """Compute a MinHash over whitespace-normalized character shingles."""
+    normalized = " ".join(text.split()).lower()
+    shingles = {
+        normalized[i : i + SHINGLE_SIZE]
+        for i in range(max(len(normalized) - SHINGLE_SIZE + 1, 1))
+    }
+    signature = MinHash(num_perm=NUM_PERM)
+    signature.update_batch([shingle.encode("utf-8") for shingle in shingles])
+    return LeanMinHash(signature)
+
+
+def _dump_minhash(signature: "LeanMinHash") -> bytes:
+    """Serialize a MinHash for storage."""
+    buffer = bytearray(signature.bytesize())
+    signature.serialize(buffer)
+    return bytes(buffer)
+
+
+class EmbeddingCache:
+    """SQLite store mapping a content hash to its embedding vector."""
+
+    def __init__(
+        self,
+        path: str,
+        model_name: str = "",
+        fuzzy_threshold: Optional[float] = 0.95,
+        max_entries: Optional[int] = 100_000,
+    ):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Path to the SQLite database file
+            model_name: Embedding model whose vectors this instance stores;
+                near-duplicate matches are limited to vectors of that model
+            fuzzy_threshold: Minimum estimated Jaccard similarity for reusing the
+                vector of a near-duplicate text (None disables fuzzy matching;
+                requires datasketch)
+            max_entries: Maximum number of vectors kept; least recently used
+                entries are pruned beyond this (None keeps everything)
+        """
+        self.path = path
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, vec BLOB)"
+        )
+        # Columns added after the first cache version
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(embeddings)")
+        }
+        if "minhash" not in columns:
+            self._conn.execute("ALTER TABLE embeddings ADD COLUMN minhash BLOB")
+        if "last_used" not in columns:
+            self._conn.execute(
+                "ALTER TABLE embeddings ADD COLUMN last_used REAL DEFAULT 0"
+            )
+        if "model" not in columns:
+            self._conn.execute("ALTER TABLE embeddings ADD COLUMN model TEXT")
+        self._conn.commit()
+
+        self.fuzzy_threshold = fuzzy_threshold if MinHash is not None else None
+        self._lsh = None
+        if self.fuzzy_threshold:
+            self._lsh = MinHashLSH(threshold=self.fuzzy_threshold, num_perm=NUM_PERM)
+            # Vectors of other models have other dimensions and can't be reused
+            rows = self._conn.execute(
+                "SELECT hash, minhash FROM embeddings "
+                "WHERE minhash IS NOT NULL AND model = ?",
+                (model_name,),
+            )
+            for key, blob in rows:
+                self._lsh.insert(key, LeanMinHash.deserialize(blob))
+
+    @staticmethod
+    def key(model_name: str, text: str) -> bytes:
+        """Hash a model name and text into a cache key."""
+        return hashlib.sha256((model_name + text).encode("utf-8")).digest()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """
+        Look up cached vectors.
+
+        Args:
+            keys: Cache keys to look up
+
+        Returns:
+            Dictionary mapping each cached key to its float16 vector
+        """
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _LOOKUP_BATCH_SIZE):
+                batch = keys[start : start + _LOOKUP_BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, vec FROM embeddings WHERE hash IN ({placeholders})",
+                    batch,
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float16)
+            self._touch(list(found))
+        return found
+
+    def find_similar(
+        self, text: str
+    ) -> Tuple[Optional[np.ndarray], Optional["LeanMinHash"]]:
+        """
+        Find the vector of a cached near-duplicate of a text.
+
+        Args:
+            text: Text that missed the exact-match lookup
+
+        Returns:
+            Tuple of (float16 vector or None, MinHash of the text or None when fuzzy
+            matching is disabled)
+        """
+        if self._lsh is None:
+            return None, None
+
+        signature = _minhash(text)
+        with self._lock:
+            # The signature is still returned so the text can be matched later
+            if self._lsh.is_empty():
+                return None, signature
+            candidates = self._lsh.query(signature)
+            best_key, best_vec, best_score = None, None, self.fuzzy_threshold
+            for start in range(0, len(candidates), _LOOKUP_BATCH_SIZE):
+                batch = candidates[start : start + _LOOKUP_BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                rows = self._conn.execute(
+                    "SELECT hash, vec, minhash FROM embeddings "
+                    f"WHERE hash IN ({placeholders}) AND model = ?",
+                    [*batch, self.model_name],
+                )
+                for key, vec_blob, minhash_blob in rows:
+                    score = signature.jaccard(LeanMinHash.deserialize(minhash_blob))
+                    if score >= best_score:
+                        best_key, best_vec, best_score = key, vec_blob, score
+            if best_key is None:
+                return None, signature
+            self._touch([best_key])
+        return np.frombuffer(best_vec, dtype=np.float16), signature
+
+    def _touch(self, keys: List[bytes]) -> None:
+        """Mark entries as recently used. Caller must hold the lock."""
+        if not keys or not self.max_entries:
+            return
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE hash = ?",
+                [(now, key) for key in keys],
+            )
+
+    def put_many(
+        self,
+        items: Dict[bytes, np.ndarray],
+        signatures: Optional[Dict[bytes, "LeanMinHash"]] = None,
+    ) -> None:
+        """
+        Store vectors in a single transaction.
+
+        Args:
+            items: Dictionary mapping cache keys to float16 vectors
+            signatures: Optional MinHash per cache key for near-duplicate lookup
+        """
+        signatures = signatures or {}
+        now = time.time()
+        rows = [
+            (
+                key,
+                vec.tobytes(),
+                (_dump_minhash(signatures[key]) if key in signatures else None),
+                now,
+                self.model_name,
+            )
+            for key, vec in items.items()
+        ]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings "
+                    "(hash, vec, minhash, last_used, model) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+            if self._lsh is not None:
+                for key, signature in signatures.items():
+                    if key in items and key not in self._lsh:
+                        self._lsh.insert(key, signature)
+            self._prune()
+
+    def _prune(self) -> None:
+        """Drop least recently used entries beyond max_entries. Caller must hold the lock."""
+        if not self.max_entries:
+            return
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        if count <= self.max_entries:
+            return
+        stale = [
+            key
+            for (key,) in self._conn.execute(
+                "SELECT hash FROM embeddings ORDER BY last_used LIMIT ?",
+                (count - self.max_entries,),
+            )
+        ]
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM embeddings WHERE hash = ?", [(key,) for key in stale]
+            )
+        if self._lsh is not None:
+            for key in stale:
+                if key in self._lsh:
+                    self._lsh.remove(key)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only calls the wrapped model for uncached texts."""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache_path: str,
+        fuzzy_threshold: Optional[float] = 0.95,
+        max_entries: Optional[int] = 100_000,
+    ):
+        """
+        Wrap an embedding model with a persistent cache.
+
+        Args:
+            embeddings: Embedding model used for cache misses
+            cache_path: Path to the SQLite cache file
+            fuzzy_threshold: Minimum similarity for reusing a near-duplicate's vector
+            max_entries: Maximum number of cached vectors
+        """
+        self.embeddings = embeddings
+        self.model_name = (
+            getattr(embeddings, "model", None) or type(embeddings).__name__
+        )
+        self.cache = EmbeddingCache(
+            cache_path,
+            model_name=self.model_name,
+            fuzzy_threshold=fuzzy_threshold,
+            max_entries=max_entries,
+        )
+
+    def _lookup(self, texts: List[str]):
+        """Return cache keys, cached vectors, cache miss indices and their MinHashes."""
+        keys = [EmbeddingCache.key(self.model_name, text) for text in texts]
+        cached = self.cache.get_many(list(set(keys)))
+
+        # Embed each uncached text once, even if it repeats within the batch.
+        # Near-duplicates of cached texts reuse the stored vector instead.
+        misses, seen = [], set()
+        reused, signatures = {}, {}
+        for i, key in enumerate(keys):
+            if key in cached or key in seen:
+                continue
+            seen.add(key)
+            vector, signature = self.cache.find_similar(texts[i])
+            if signature is not None:
+                signatures[key] = signature
+            if vector is not None:
+                reused[key] = vector
+            else:
+                misses.append(i)
+
+        if reused:
+            self.cache.put_many(reused, signatures)
+            cached.update(reused)
+        return keys, cached, misses, signatures
+
+    def _merge(
+        self,
+        keys: List[bytes],
+        cached: Dict[bytes, np.ndarray],
+        misses: List[int],
+        signatures: Dict[bytes, "LeanMinHash"],
+        new_vectors: List[List[float]],
+    ) -> np.ndarray:
+        """Store freshly embedded vectors and return a float16 matrix in input order."""
+        new_items = {
+            keys[i]: np.asarray(vec, dtype=np.float16)
+            for i, vec in zip(misses, new_vectors)
+        }
+        if new_items:
+            self.cache.put_many(new_items, signatures)
+        cached.update(new_items)
+        vectors = [cached[key] for key in keys]
+        if len({vector.shape for vector in vectors}) > 1:
+            raise ValueError(
+                f"Cached embeddings for {self.model_name} have mixed dimensions; "
+                f"delete {self.cache.path} to rebuild the cache"
+            )
+        return np.stack(vectors)
+
+    def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed documents into a float16 matrix, reusing cached vectors where available.
+
+        Args:
+            texts: Non-empty list of texts to embed
+
+        Returns:
+            Array of shape (len(texts), dimensions)
+        """
+        keys, cached, misses, signatures = self._lookup(texts)
+        new_vectors = (
+            self.embeddings.embed_documents([texts[i] for i in misses])
+            if misses
+            else []
+        )
+        return self._merge(keys, cached, misses, signatures, new_vectors)
+
+    async def aembed_matrix(self, texts: List[str]) -> np.ndarray:
+        """Asynchronously embed documents into a float16 matrix."""
+        # Hashing and SQLite work run on a thread so other requests keep flowing
+        keys, cached, misses, signatures = await asyncio.to_thread(self._lookup, texts)
+        new_vectors = (
+            await self.embeddings.aembed_documents([texts[i] for i in misses])
+            if misses
+            else []
+        )
+        return await asyncio.to_thread(
+            self._merge, keys, cached, misses, signatures, new_vectors
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, reusing cached vectors where available."""
+        if not texts:
+            return []
+        return self.embed_matrix(texts).astype(np.float32).tolist()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronously embed documents, reusing cached vectors where available."""
+        if not texts:
+            return []
+        return (await self.aembed_matrix(texts)).astype(np.float32).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query. Queries are not cached."""
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Asynchronously embed a query. Queries are not cached."""
+        return await self.embeddings.aembed_query(text)
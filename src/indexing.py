@@ -1,11 +1,103 @@
 """Document indexing and vector store management."""
 
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.embeddings import Embeddings
 from langchain_chroma import Chroma
 from langchain_openai import OpenAIEmbeddings
+from openai import RateLimitError
+import asyncio
+import chromadb
+import functools
+import hashlib
 import os
+import numpy as np
+import tiktoken
+
+from .embed_cache import CachedEmbeddings
+from .splitting import BoundaryTextSplitter
+
+try:
+    from semantic_text_splitter import TextSplitter
+except ImportError:  # Fall back to the pure-Python splitter
+    TextSplitter = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # Local embeddings are optional
+    SentenceTransformer = None
+
+# Tokenizer used by OpenAI chat and embedding models; chunk sizes are in its tokens
+TOKENIZER_MODEL = "gpt-3.5-turbo"
+TOKENIZER_ENCODING = "cl100k_base"
+
+
+@functools.lru_cache(maxsize=None)
+def _encoding() -> "tiktoken.Encoding":
+    """Load the tokenizer once, on first use."""
+    return tiktoken.get_encoding(TOKENIZER_ENCODING)
+
+
+def _token_offsets(text: str) -> List[int]:
+    """Tokenize a text and return the character offset of each token."""
+    encoding = _encoding()
+    # Special-token strings like <|endoftext|> are ordinary text in documents
+    _, offsets = encoding.decode_with_offsets(encoding.encode_ordinary(text))
+    return offsets
+
+
+# Inputs sent to the OpenAI embeddings endpoint per request (API limit is 2048)
+EMBEDDING_REQUEST_SIZE = 512
+# Chunks embedded together in one batch
+INDEX_BATCH_SIZE = 256
+# Records per collection.add call; larger adds amortize Chroma's per-call persistence
+ADD_BATCH_SIZE = 250
+# HNSW parameters set when a collection is created (they can't be changed later)
+HNSW_METADATA = {"hnsw:space": "l2", "hnsw:M": 32, "hnsw:construction_ef": 200}
+# Embedding requests allowed in flight at the same time
+MAX_CONCURRENT_REQUESTS = 8
+# Attempts per batch before a rate limit error is surfaced
+MAX_EMBED_ATTEMPTS = 5
+# Model used by the local embedding backend
+LOCAL_EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"
+# Texts per forward pass of the local model
+LOCAL_BATCH_SIZE = 256
+
+
+class LocalEmbeddings(Embeddings):
+    """Embeddings computed in-process with sentence-transformers (GPU if available)."""
+
+    def __init__(
+        self, model_name: str = LOCAL_EMBEDDING_MODEL, device: Optional[str] = None
+    ):
+        """
+        Load a sentence-transformers model.
+
+        Args:
+            model_name: Hugging Face model name
+            device: Torch device such as "cuda" or "cpu" (default: picked
+                automatically, preferring a GPU)
+        """
+        if SentenceTransformer is None:
+            raise ImportError(
+                "The local embedding backend requires sentence-transformers. "
+                "Install it with: pip install sentence-transformers"
+            )
+        self.model = model_name
+        self._model = SentenceTransformer(model_name, device=device)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents in batches on the model's device."""
+        return self._model.encode(
+            texts,
+            batch_size=LOCAL_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        ).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query."""
+        return self.embed_documents([text])[0]
 
 
 class DocumentIndexer:
@@ -17,29 +109,89 @@ class DocumentIndexer:
         chunk_overlap: int = 200,
         embedding_model: Optional[str] = None,
         persist_directory: str = "./chroma_db",
+        cache_path: Optional[str] = "./embedding_cache.db",
+        embedding_backend: str = "openai",
+        fuzzy_threshold: Optional[float] = 0.95,
     ):
         """
         Initialize the document indexer.
 
         Args:
-            chunk_size: Size of text chunks for splitting
-            chunk_overlap: Overlap between chunks
-            embedding_model: Name of embedding model (OpenAI only, requires OPENAI_API_KEY)
+            chunk_size: Size of text chunks for splitting, in tokens
+            chunk_overlap: Overlap between chunks, in tokens
+            embedding_model: Name of embedding model
             persist_directory: Directory to persist vector store
+            cache_path: SQLite file caching embeddings by content hash
+                (None disables the cache)
+            embedding_backend: "openai" (requires OPENAI_API_KEY) or "local"
+                (sentence-transformers). Queries use the same backend, so an
+                index must be rebuilt after switching.
+            fuzzy_threshold: Minimum similarity for reusing the cached vector
+                of a near-duplicate chunk (None disables near-duplicate matching)
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.persist_directory = persist_directory
 
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", " ", ""],
-        )
+        # Chunks are measured in tokens, which is what the models are billed by
+        if TextSplitter is not None:
+            # Rust splitter: same semantic boundaries, native splitting loop
+            self.text_splitter = TextSplitter.from_tiktoken_model(
+                TOKENIZER_MODEL, chunk_size, overlap=chunk_overlap
+            )
+        else:
+            self.text_splitter = BoundaryTextSplitter(
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                separators=["\n\n", "\n", " "],
+                offsets_function=_token_offsets,
+            )
 
-        self.embeddings = self._get_embeddings(embedding_model)
+        if embedding_backend == "local":
+            self.embeddings = LocalEmbeddings(embedding_model or LOCAL_EMBEDDING_MODEL)
+            # A single model instance gains nothing from concurrent calls
+            self.max_concurrent_requests = 1
+        elif embedding_backend == "openai":
+            self.embeddings = self._get_embeddings(embedding_model)
+            self.max_concurrent_requests = MAX_CONCURRENT_REQUESTS
+        else:
+            raise ValueError(f"Unknown embedding backend: {embedding_backend}")
+        if cache_path:
+            self.embeddings = CachedEmbeddings(
+                self.embeddings, cache_path, fuzzy_threshold=fuzzy_threshold
+            )
         self.vector_store = None
+        self._client = None
+        self._stores: Dict[str, Chroma] = {}
+
+    def _get_vector_store(self, collection_name: str) -> Chroma:
+        """Open a collection through a shared persistent Chroma client, once per name."""
+        if collection_name in self._stores:
+            return self._stores[collection_name]
+        if self._client is None:
+            self._client = chromadb.PersistentClient(path=self.persist_directory)
+        store = Chroma(
+            client=self._client,
+            collection_name=collection_name,
+            embedding_function=self.embeddings,
+            collection_metadata=HNSW_METADATA,
+        )
+        self._stores[collection_name] = store
+        return store
+
+    @property
+    def index_settings(self) -> Dict[str, object]:
+        """Settings that chunks and vectors in the index depend on."""
+        embeddings = self.embeddings
+        if isinstance(embeddings, CachedEmbeddings):
+            model_name = embeddings.model_name
+        else:
+            model_name = getattr(embeddings, "model", None) or type(embeddings).__name__
+        return {
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+            "embedding_model": model_name,
+        }
 
     def _get_embeddings(self, model_name: Optional[str] = None):
         """Get OpenAI embedding model. Requires OPENAI_API_KEY to be set."""
@@ -49,7 +201,7 @@ class DocumentIndexer:
             )
 
         try:
-            return OpenAIEmbeddings()
+            return OpenAIEmbeddings(chunk_size=EMBEDDING_REQUEST_SIZE, max_retries=6)
         except Exception as e:
             raise RuntimeError(
                 f"Failed to initialize OpenAI embeddings: {e}. "
@@ -70,11 +222,44 @@ class DocumentIndexer:
             return []
 
         print(f"Chunking {len(documents)} documents...")
-        chunks = self.text_splitter.split_documents(documents)
+        chunks = self.split_documents(documents)
         print(f"Created {len(chunks)} chunks")
 
         return chunks
 
+    def split_documents(self, documents: List[Document]) -> List[Document]:
+        """
+        Split documents with whichever splitter is available, keeping metadata.
+
+        Args:
+            documents: List of Document objects to split
+
+        Returns:
+            List of chunked Document objects, each with an id derived from its
+            source and position within that source
+        """
+        if TextSplitter is None:
+            chunks = self.text_splitter.split_documents(documents)
+        else:
+            texts = self.text_splitter.chunk_all(
+                [doc.page_content for doc in documents]
+            )
+            chunks = [
+                Document(page_content=text, metadata=dict(doc.metadata))
+                for doc, doc_texts in zip(documents, texts)
+                for text in doc_texts
+            ]
+
+        # Stable ids let a reindex replace exactly the chunks of a changed file
+        counters = {}
+        for chunk in chunks:
+            source = chunk.metadata.get("source", "")
+            index = counters.get(source, 0)
+            counters[source] = index + 1
+            key = f"{source}:{index}".encode("utf-8")
+            chunk.id = hashlib.sha256(key).hexdigest()
+        return chunks
+
     def index_documents(
         self, documents: List[Document], collection_name: str = "documents"
     ) -> Chroma:
@@ -94,17 +279,130 @@ class DocumentIndexer:
         chunks = self.chunk_documents(documents)
 
         print(f"Indexing {len(chunks)} chunks into vector store...")
-
-        self.vector_store = Chroma.from_documents(
-            documents=chunks,
-            embedding=self.embeddings,
-            persist_directory=self.persist_directory,
-            collection_name=collection_name,
+        batches = (
+            chunks[start : start + INDEX_BATCH_SIZE]
+            for start in range(0, len(chunks), INDEX_BATCH_SIZE)
         )
+        return self.index_chunk_batches(batches, collection_name)
+
+    def index_chunk_batches(
+        self, batches: Iterable[List[Document]], collection_name: str = "documents"
+    ) -> Chroma:
+        """
+        Index batches of already chunked documents as they become available.
+
+        Args:
+            batches: Iterable of chunk batches; it may block while waiting for
+                upstream stages to produce the next batch
+            collection_name: Name of the collection in the vector store
+
+        Returns:
+            Chroma vector store instance
+        """
+        self.vector_store = self._get_vector_store(collection_name)
 
-        print(f"Indexing complete! Vector store saved to {self.persist_directory}")
+        count = asyncio.run(self._aindex(iter(batches)))
+
+        print(f"Indexing complete! {count} chunks saved to {self.persist_directory}")
         return self.vector_store
 
+    async def _aindex(self, batches: Iterator[List[Document]]) -> int:
+        """
+        Embed chunk batches with concurrent requests and write them to the vector store.
+
+        Args:
+            batches: Iterator of chunk batches
+
+        Returns:
+            Number of chunks indexed
+        """
+        collection = self.vector_store._collection
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        # Writes run off the event loop, one at a time
+        write_lock = asyncio.Lock()
+        tasks = []
+        count = 0
+
+        async def embed_one(batch: List[Document]) -> None:
+            try:
+                texts = [chunk.page_content for chunk in batch]
+                embeddings = await self._aembed_with_backoff(texts)
+                async with write_lock:
+                    await asyncio.to_thread(
+                        self._add_to_collection, collection, batch, embeddings
+                    )
+            finally:
+                semaphore.release()
+
+        while True:
+            # Only pull the next batch once a request slot is free
+            await semaphore.acquire()
+            for task in tasks:
+                if task.done() and task.exception():
+                    raise task.exception()
+
+            batch = await asyncio.to_thread(next, batches, None)
+            if batch is None:
+                semaphore.release()
+                break
+            count += len(batch)
+            tasks.append(asyncio.create_task(embed_one(batch)))
+
+        await asyncio.gather(*tasks)
+        return count
+
+    @staticmethod
+    def _add_to_collection(
+        collection, chunks: List[Document], embeddings: np.ndarray
+    ) -> None:
+        """Write chunks with precomputed embeddings, bypassing Chroma's embedding path."""
+        for start in range(0, len(chunks), ADD_BATCH_SIZE):
+            batch = chunks[start : start + ADD_BATCH_SIZE]
+            # Vectors are kept as float16; Chroma's HNSW index only takes float32
+            vectors = embeddings[start : start + ADD_BATCH_SIZE].astype(np.float32)
+            collection.upsert(
+                ids=[chunk.id for chunk in batch],
+                embeddings=vectors.tolist(),
+                documents=[chunk.page_content for chunk in batch],
+                metadatas=[chunk.metadata for chunk in batch],
+            )
+
+    async def _aembed_with_backoff(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into a float16 matrix, retrying with exponential backoff when rate limited."""
+        for attempt in range(MAX_EMBED_ATTEMPTS):
+            try:
+                if isinstance(self.embeddings, CachedEmbeddings):
+                    return await self.embeddings.aembed_matrix(texts)
+                vectors = await self.embeddings.aembed_documents(texts)
+                return np.asarray(vectors, dtype=np.float16)
+            except RateLimitError:
+                if attempt == MAX_EMBED_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(2**attempt)
+
+    def delete_chunks(self, ids: List[str], collection_name: str = "documents") -> None:
+        """
+        Remove chunks from the vector store.
+
+        Args:
+            ids: Ids of the chunks to remove
+            collection_name: Name of the collection in the vector store
+        """
+        collection = self._get_vector_store(collection_name)._collection
+        for start in range(0, len(ids), ADD_BATCH_SIZE):
+            collection.delete(ids=ids[start : start + ADD_BATCH_SIZE])
+
+    def reset_collection(self, collection_name: str = "documents") -> None:
+        """
+        Drop every chunk in a collection.
+
+        Args:
+            collection_name: Name of the collection in the vector store
+        """
+        self._get_vector_store(collection_name).delete_collection()
+        # The wrapper is unusable once its collection is gone
+        del self._stores[collection_name]
+
     def load_existing_index(self, collection_name: str = "documents") -> Chroma:
         """
         Load an existing vector store from disk.
@@ -119,10 +417,6 @@ class DocumentIndexer:
             raise ValueError(f"Vector store not found at {self.persist_directory}")
 
         print(f"Loading existing vector store from {self.persist_directory}...")
-        self.vector_store = Chroma(
-            persist_directory=self.persist_directory,
-            embedding_function=self.embeddings,
-            collection_name=collection_name,
-        )
+        self.vector_store = self._get_vector_store(collection_name)
 
         return self.vector_store
@@ -1,16 +1,28 @@
 """Document loaders for various file formats."""
 
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 from langchain_community.document_loaders import (
     TextLoader,
-    PyPDFLoader,
     UnstructuredWordDocumentLoader,
     UnstructuredImageLoader,
     UnstructuredMarkdownLoader,
     CSVLoader,
 )
 from langchain_core.documents import Document
+from pypdf import PdfReader
+
+# Parser processes start from a clean server process rather than a fork of this
+# one: loading runs on a pipeline thread, and forking a multi-threaded process
+# can deadlock the child
+_POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
 
 
 class DocumentLoader:
@@ -24,6 +36,15 @@ class DocumentLoader:
     MARKDOWN_EXTENSIONS = {".md", ".markdown"}
     CSV_EXTENSIONS = {".csv"}
 
+    # Threads used to extract text from the pages of a single PDF
+    PDF_PAGE_WORKERS = 4
+
+    # Formats whose loading is mostly file reading; they are read on threads in
+    # the calling process while the process pool parses everything else
+    READ_EXTENSIONS = TEXT_EXTENSIONS | CSV_EXTENSIONS
+    # Threads used to read those files concurrently
+    READ_WORKERS = 8
+
     @classmethod
     def load_document(cls, file_path: str) -> List[Document]:
         """
@@ -47,8 +68,7 @@ class DocumentLoader:
                 docs = loader.load()
 
             elif extension in cls.PDF_EXTENSIONS:
-                loader = PyPDFLoader(str(file_path))
-                docs = loader.load()
+                docs = cls._load_pdf(file_path)
 
             elif extension in cls.DOCX_EXTENSIONS:
                 loader = UnstructuredWordDocumentLoader(str(file_path))
@@ -82,22 +102,46 @@ class DocumentLoader:
             return []
 
     @classmethod
-    def load_folder(cls, folder_path: str) -> List[Document]:
+    def _load_pdf(cls, file_path: Path) -> List[Document]:
         """
-        Load all supported documents from a folder.
+        Load a PDF with one Document per page, extracting pages concurrently.
 
         Args:
-            folder_path: Path to the folder containing documents
+            file_path: Path to the PDF file
 
         Returns:
-            List of all Document objects from the folder
+            List of Document objects, one per page
         """
-        folder_path = Path(folder_path)
-        if not folder_path.exists():
-            raise ValueError(f"Folder not found: {folder_path}")
+        data = file_path.read_bytes()
+        total_pages = len(PdfReader(io.BytesIO(data)).pages)
+        local = threading.local()
+
+        def extract(index: int) -> str:
+            # PdfReader isn't thread-safe, so each thread parses its own copy
+            if not hasattr(local, "reader"):
+                local.reader = PdfReader(io.BytesIO(data))
+            return local.reader.pages[index].extract_text() or ""
 
-        all_documents = []
-        supported_extensions = (
+        workers = max(min(cls.PDF_PAGE_WORKERS, total_pages), 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            texts = list(executor.map(extract, range(total_pages)))
+
+        return [
+            Document(
+                page_content=text,
+                metadata={
+                    "source": str(file_path),
+                    "page": i,
+                    "total_pages": total_pages,
+                },
+            )
+            for i, text in enumerate(texts)
+        ]
+
+    @classmethod
+    def supported_extensions(cls) -> set:
+        """Return the set of all file extensions the loader can handle."""
+        return (
             cls.TEXT_EXTENSIONS
             | cls.PDF_EXTENSIONS
             | cls.DOCX_EXTENSIONS
@@ -106,12 +150,145 @@ class DocumentLoader:
             | cls.CSV_EXTENSIONS
         )
 
-        # Recursively find all supported files
-        for file_path in folder_path.rglob("*"):
-            if file_path.is_file() and file_path.suffix.lower() in supported_extensions:
-                print(f"Loading: {file_path.name}")
-                docs = cls.load_document(str(file_path))
-                all_documents.extend(docs)
+    @classmethod
+    def list_files(cls, folder_path: str) -> List[str]:
+        """
+        Recursively list all supported files in a folder.
+
+        Args:
+            folder_path: Path to the folder containing documents
+
+        Returns:
+            List of file paths with a supported extension
+        """
+        supported_extensions = cls.supported_extensions()
+        file_paths = []
+        # One directory read per folder; DirEntry caches the type from readdir
+        stack = [str(Path(folder_path))]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except PermissionError:
+                # Skip unreadable folders instead of aborting the whole scan
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif (
+                        entry.is_file()
+                        and os.path.splitext(entry.name)[1].lower()
+                        in supported_extensions
+                    ):
+                        # Same form as Path.rglob and Document metadata
+                        file_paths.append(str(Path(entry.path)))
+        return file_paths
+
+    @classmethod
+    def _load_with_path(cls, file_path: str) -> Tuple[str, List[Document]]:
+        """Load a document and pair it with the path it was loaded from."""
+        return file_path, cls.load_document(file_path)
+
+    @classmethod
+    def iter_files(
+        cls, file_paths: List[str], workers: Optional[int] = None, chunksize: int = 1
+    ) -> Iterator[Tuple[str, List[Document]]]:
+        """
+        Load files in parallel across processes, yielding each file's documents
+        as soon as it has been parsed.
+
+        Plain text and CSV files skip the process pool: they are read on a
+        thread pool in this process, overlapping their IO with the parsing of
+        PDFs, Word documents and images in the worker processes.
+
+        Args:
+            file_paths: Paths of the files to load
+            workers: Number of worker processes (default: CPU count - 1).
+                Use 1 to parse sequentially in the current process.
+            chunksize: Number of files handed to a worker at a time. Keep it
+                small so a few large PDFs don't hold up the remaining files.
+
+        Yields:
+            Tuple of (path as given in file_paths, Document objects of that
+            file), in completion order
+        """
+        read_paths, parse_paths = [], []
+        for file_path in file_paths:
+            print(f"Loading: {Path(file_path).name}")
+            if Path(file_path).suffix.lower() in cls.READ_EXTENSIONS:
+                read_paths.append(file_path)
+            else:
+                parse_paths.append(file_path)
+
+        if workers is None:
+            workers = max((os.cpu_count() or 1) - 1, 1)
+        workers = min(workers, len(parse_paths))
+
+        if workers <= 1:
+            with ThreadPoolExecutor(max_workers=cls.READ_WORKERS) as executor:
+                reads = [executor.submit(cls._load_with_path, p) for p in read_paths]
+                for file_path in parse_paths:
+                    yield cls._load_with_path(file_path)
+                for future in as_completed(reads):
+                    yield future.result()
+        else:
+            with _POOL_CONTEXT.Pool(workers) as pool:
+                parsed = pool.imap_unordered(
+                    cls._load_with_path, parse_paths, chunksize=chunksize
+                )
+                with ThreadPoolExecutor(max_workers=cls.READ_WORKERS) as executor:
+                    reads = [
+                        executor.submit(cls._load_with_path, p) for p in read_paths
+                    ]
+                    for future in as_completed(reads):
+                        yield future.result()
+                yield from parsed
+
+    @classmethod
+    def load_files(
+        cls, file_paths: List[str], workers: Optional[int] = None, chunksize: int = 1
+    ) -> List[Document]:
+        """
+        Load a list of files, parsing them in parallel across processes.
+
+        Args:
+            file_paths: Paths of the files to load
+            workers: Number of worker processes (default: CPU count - 1)
+            chunksize: Number of files handed to a worker at a time
+
+        Returns:
+            List of all Document objects from the files
+        """
+        return [
+            doc
+            for _, docs in cls.iter_files(
+                file_paths, workers=workers, chunksize=chunksize
+            )
+            for doc in docs
+        ]
+
+    @classmethod
+    def load_folder(
+        cls, folder_path: str, workers: Optional[int] = None, chunksize: int = 1
+    ) -> List[Document]:
+        """
+        Load all supported documents from a folder.
+
+        Args:
+            folder_path: Path to the folder containing documents
+            workers: Number of worker processes (default: CPU count - 1)
+            chunksize: Number of files handed to a worker at a time
+
+        Returns:
+            List of all Document objects from the folder
+        """
+        folder_path = Path(folder_path)
+        if not folder_path.exists():
+            raise ValueError(f"Folder not found: {folder_path}")
+
+        # Recursively find all supported files, then parse them in parallel
+        file_paths = cls.list_files(str(folder_path))
+        all_documents = cls.load_files(file_paths, workers=workers, chunksize=chunksize)
 
         print(f"\nLoaded {len(all_documents)} document chunks from {folder_path}")
         return all_documents
@@ -0,0 +1,82 @@
+"""Manifest of indexed files, used to skip unchanged files on reindex."""
+
+from typing import Dict, List, Tuple
+import json
+import os
+
+# Manifest file name inside the vector store's persist directory
+MANIFEST_NAME = "manifest.json"
+
+
+def manifest_path(persist_directory: str) -> str:
+    """Return the manifest location for a vector store directory."""
+    return os.path.join(persist_directory, MANIFEST_NAME)
+
+
+def load_manifest(path: str) -> Dict[str, dict]:
+    """
+    Load a manifest from disk.
+
+    Args:
+        path: Path to the manifest JSON file
+
+    Returns:
+        Dictionary with the index 'settings' the chunks were built with
+        (chunk size, overlap and embedding model) and 'files', mapping each
+        indexed file path to its 'mtime', 'size' and chunk 'ids'. Both are
+        empty if the manifest doesn't exist or predates the settings header.
+    """
+    manifest = {"settings": {}, "files": {}}
+    if not os.path.exists(path):
+        return manifest
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if "settings" in data and "files" in data:
+        manifest.update(data)
+    return manifest
+
+
+def save_manifest(path: str, manifest: Dict[str, dict]) -> None:
+    """
+    Write a manifest to disk, replacing any previous version atomically.
+
+    Args:
+        path: Path to the manifest JSON file
+        manifest: Dictionary as returned by load_manifest
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+def file_signature(file_path: str) -> Tuple[int, int]:
+    """Return the (mtime in nanoseconds, size) pair used to detect changes."""
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def diff_manifest(
+    files: Dict[str, dict], file_paths: List[str]
+) -> Tuple[List[str], List[str]]:
+    """
+    Compare the files recorded in a manifest with those currently in the folder.
+
+    Args:
+        files: The manifest's 'files' dictionary
+        file_paths: Paths of the supported files currently in the folder
+
+    Returns:
+        Tuple of (new or modified file paths, paths of files that were removed)
+    """
+    changed = []
+    for file_path in file_paths:
+        entry = files.get(file_path)
+        mtime, size = file_signature(file_path)
+        if entry is None or entry["mtime"] != mtime or entry["size"] != size:
+            changed.append(file_path)
+
+    current = set(file_paths)
+    removed = [file_path for file_path in files if file_path not in current]
+    return changed, removed
@@ -0,0 +1,175 @@
+"""Streaming load -> chunk -> embed indexing pipeline."""
+
+from typing import Iterator, List, Optional
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+import queue
+import threading
+
+from .indexing import INDEX_BATCH_SIZE, DocumentIndexer
+from .loaders import DocumentLoader
+from .manifest import (
+    diff_manifest,
+    file_signature,
+    load_manifest,
+    manifest_path,
+    save_manifest,
+)
+
+# Marks the end of a stage's output
+_DONE = object()
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put an item on a bounded queue, giving up once the pipeline is stopping."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    """Get an item from a queue, returning _DONE once the pipeline is stopping."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def index_folder(
+    folder_path: str,
+    indexer: DocumentIndexer,
+    collection_name: str = "documents",
+    loader_workers: Optional[int] = None,
+    queue_size: int = 4,
+    rebuild: bool = False,
+) -> Optional[Chroma]:
+    """
+    Load, chunk and index a folder with the three stages running concurrently.
+
+    A loader thread parses files, a chunker thread splits them into batches
+    of chunks, and the calling thread embeds and stores those batches. The
+    stages are connected by bounded queues, so embedding starts as soon as
+    the first file is parsed and memory use stays flat regardless of corpus
+    size.
+
+    A manifest of each file's mtime, size and chunk ids is kept next to the
+    vector store. Only new or modified files are loaded; chunks of modified
+    and deleted files are removed first. The whole collection is rebuilt when
+    requested, or when the chunking or embedding settings differ from those
+    recorded in the manifest.
+
+    Args:
+        folder_path: Path to the folder containing documents
+        indexer: Indexer used for chunking and embedding
+        collection_name: Name of the collection in the vector store
+        loader_workers: Number of processes used to parse documents
+        queue_size: Maximum number of items waiting between two stages
+        rebuild: Drop the existing collection and index every file
+
+    Returns:
+        Chroma vector store instance, or None if the folder has no supported files
+    """
+    file_paths = DocumentLoader.list_files(folder_path)
+    if not file_paths:
+        return None
+
+    path = manifest_path(indexer.persist_directory)
+    manifest = load_manifest(path)
+    files = manifest["files"]
+    # Chunks indexed without a manifest, or with other settings, can't be reused
+    if rebuild or not files or manifest["settings"] != indexer.index_settings:
+        if files and not rebuild:
+            print("Index settings changed, rebuilding the index...")
+        indexer.reset_collection(collection_name)
+        files = {}
+    manifest = {"settings": indexer.index_settings, "files": files}
+
+    changed, removed = diff_manifest(files, file_paths)
+    stale_ids = [
+        chunk_id
+        for file_path in changed + removed
+        for chunk_id in files.get(file_path, {}).get("ids", [])
+    ]
+    if stale_ids:
+        print(f"Removing {len(stale_ids)} outdated chunks...")
+        indexer.delete_chunks(stale_ids, collection_name)
+    for file_path in removed:
+        del files[file_path]
+
+    if not changed:
+        save_manifest(path, manifest)
+        print("All documents are up to date.")
+        return indexer.load_existing_index(collection_name)
+    print(f"{len(changed)} of {len(file_paths)} files are new or modified")
+    for file_path in changed:
+        files.pop(file_path, None)
+    signatures = {file_path: file_signature(file_path) for file_path in changed}
+
+    chunk_q = queue.Queue(maxsize=queue_size)
+    embed_q = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors = []
+    chunk_ids = {}
+
+    def load() -> None:
+        try:
+            for item in DocumentLoader.iter_files(changed, workers=loader_workers):
+                if item[1] and not _put(chunk_q, item, stop):
+                    return
+        except Exception as e:
+            errors.append(e)
+        finally:
+            _put(chunk_q, _DONE, stop)
+
+    def chunk() -> None:
+        try:
+            batch: List[Document] = []
+            while (item := _get(chunk_q, stop)) is not _DONE:
+                file_path, docs = item
+                chunks = indexer.split_documents(docs)
+                chunk_ids[file_path] = [c.id for c in chunks]
+                batch.extend(chunks)
+                while len(batch) >= INDEX_BATCH_SIZE:
+                    if not _put(embed_q, batch[:INDEX_BATCH_SIZE], stop):
+                        return
+                    batch = batch[INDEX_BATCH_SIZE:]
+            if batch:
+                _put(embed_q, batch, stop)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            _put(embed_q, _DONE, stop)
+
+    def batches() -> Iterator[List[Document]]:
+        while (batch := _get(embed_q, stop)) is not _DONE:
+            yield batch
+
+    threads = [
+        threading.Thread(target=load, name="loader", daemon=True),
+        threading.Thread(target=chunk, name="chunker", daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        vector_store = indexer.index_chunk_batches(batches(), collection_name)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+
+    # Files that produced no chunks are left out so they are retried next time
+    for file_path, ids in chunk_ids.items():
+        mtime, size = signatures[file_path]
+        files[file_path] = {"mtime": mtime, "size": size, "ids": ids}
+    save_manifest(path, manifest)
+    return vector_store
@@ -0,0 +1,164 @@
+"""Semantic cache of previously answered questions."""
+
+from typing import Any, Dict, List, Optional
+from langchain_core.documents import Document
+import json
+import sqlite3
+import threading
+import numpy as np
+
+
+def _dump_result(result: Dict[str, Any]) -> str:
+    """Serialize an answer_question result to JSON."""
+    return json.dumps(
+        {
+            "answer": result["answer"],
+            "sources": result["sources"],
+            "context": [
+                {"page_content": doc.page_content, "metadata": doc.metadata}
+                for doc in result["context"]
+            ],
+        }
+    )
+
+
+def _load_result(blob: str) -> Dict[str, Any]:
+    """Deserialize a result stored by _dump_result."""
+    result = json.loads(blob)
+    result["context"] = [Document(**doc) for doc in result["context"]]
+    return result
+
+
+class ResponseCache:
+    """
+    Maps question embeddings to answers, matching on cosine similarity.
+
+    Vectors are held in memory as a normalized matrix, so a lookup is a single
+    matrix-vector product; SQLite keeps them across runs.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        settings: Optional[Dict[str, Any]] = None,
+        threshold: float = 0.95,
+        max_entries: Optional[int] = 1000,
+    ):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Path to the SQLite database file
+            settings: Settings the answers depend on, such as the model and the
+                number of retrieved chunks; only answers stored under equal
+                settings are reused
+            threshold: Minimum cosine similarity for a question to reuse an answer
+            max_entries: Maximum number of answers kept; the oldest are dropped
+                beyond this (None keeps everything)
+        """
+        self.path = path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._settings = json.dumps(settings or {}, sort_keys=True)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(id INTEGER PRIMARY KEY AUTOINCREMENT, vec BLOB, result TEXT)"
+        )
+        # Columns added after the first cache version
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(responses)")
+        }
+        if "settings" not in columns:
+            self._conn.execute("ALTER TABLE responses ADD COLUMN settings TEXT")
+        self._conn.commit()
+
+        rows = self._conn.execute(
+            "SELECT id, vec FROM responses WHERE settings = ? ORDER BY id",
+            (self._settings,),
+        ).fetchall()
+        self._ids: List[int] = [row_id for row_id, _ in rows]
+        self._vectors = (
+            np.stack([np.frombuffer(blob, dtype=np.float32) for _, blob in rows])
+            if rows
+            else None
+        )
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        """Scale a vector to unit length so dot products are cosine similarities."""
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, vector: List[float]) -> Optional[Dict[str, Any]]:
+        """
+        Find the answer to the most similar cached question.
+
+        Args:
+            vector: Embedding of the new question
+
+        Returns:
+            Cached result dictionary, or None if no question is similar enough
+        """
+        with self._lock:
+            if self._vectors is None:
+                return None
+            scores = self._vectors @ self._normalize(vector)
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            row = self._conn.execute(
+                "SELECT result FROM responses WHERE id = ?", (self._ids[best],)
+            ).fetchone()
+        return _load_result(row[0]) if row else None
+
+    def add(self, vector: List[float], result: Dict[str, Any]) -> None:
+        """
+        Store the answer to a question.
+
+        Args:
+            vector: Embedding of the question
+            result: Result dictionary from answer_question
+        """
+        vector = self._normalize(vector)
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.execute(
+                    "INSERT INTO responses (vec, result, settings) VALUES (?, ?, ?)",
+                    (vector.tobytes(), _dump_result(result), self._settings),
+                )
+            self._ids.append(cursor.lastrowid)
+            self._vectors = (
+                vector[None, :]
+                if self._vectors is None
+                else np.vstack([self._vectors, vector])
+            )
+            self._prune()
+
+    def _prune(self) -> None:
+        """Drop the oldest entries beyond max_entries. Caller must hold the lock."""
+        if not self.max_entries or len(self._ids) <= self.max_entries:
+            return
+        excess = len(self._ids) - self.max_entries
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM responses WHERE id <= ? AND settings = ?",
+                (self._ids[excess - 1], self._settings),
+            )
+        self._ids = self._ids[excess:]
+        self._vectors = self._vectors[excess:]
+
+    def clear(self) -> None:
+        """Drop every cached answer, e.g. after the documents were reindexed."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM responses")
+            self._ids = []
+            self._vectors = None
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -3,17 +3,22 @@
 from typing import Dict, Optional, Any
 from langchain_chroma import Chroma
 from langchain_openai import ChatOpenAI
-from langchain_classic.chains import create_retrieval_chain
 from langchain_classic.chains.combine_documents import create_stuff_documents_chain
 from langchain_core.prompts import ChatPromptTemplate
 import os
 
+from .qa_cache import ResponseCache
+
 
 class QARetriever:
     """Handles question answering with retrieval-augmented generation."""
 
     def __init__(
-        self, vector_store: Chroma, llm_model: Optional[str] = None, k: int = 4
+        self,
+        vector_store: Chroma,
+        llm_model: Optional[str] = None,
+        k: int = 4,
+        cache_path: Optional[str] = "./qa_cache.db",
     ):
         """
         Initialize the QA retriever.
@@ -22,6 +27,8 @@ class QARetriever:
             vector_store: Chroma vector store instance
             llm_model: Name of LLM model to use
             k: Number of documents to retrieve for each query
+            cache_path: SQLite file caching answers to semantically similar
+                questions (None disables the cache)
         """
         self.vector_store = vector_store
         self.k = k
@@ -29,8 +36,22 @@ class QARetriever:
         # Initialize LLM
         self.llm = self._get_llm(llm_model)
 
-        # Create retrieval QA chain
-        self.qa_chain = self._create_qa_chain()
+        # Answers are only reused under the settings they were produced with
+        self.cache = None
+        if cache_path:
+            embeddings = self.vector_store.embeddings
+            settings = {
+                "k": self.k,
+                "llm_model": self.llm.model_name,
+                "embedding_model": getattr(embeddings, "model_name", None)
+                or getattr(embeddings, "model", None)
+                or type(embeddings).__name__,
+            }
+            self.cache = ResponseCache(cache_path, settings=settings)
+
+        # Build the retriever and document chain once and call them directly
+        self.retriever = self.vector_store.as_retriever(search_kwargs={"k": self.k})
+        self.document_chain = self._create_document_chain()
 
     def _get_llm(self, model_name: Optional[str] = None):
         """Get OpenAI LLM. Requires OPENAI_API_KEY to be set."""
@@ -48,8 +69,8 @@ class QARetriever:
                 "Please check your OPENAI_API_KEY is valid."
             ) from e
 
-    def _create_qa_chain(self) -> Any:
-        """Create the retrieval QA chain using LangChain API."""
+    def _create_document_chain(self) -> Any:
+        """Create the chain that answers a question from retrieved documents."""
         if self.llm is None:
             raise ValueError("LLM is not initialized. OPENAI_API_KEY is required.")
 
@@ -66,14 +87,7 @@ class QARetriever:
             ]
         )
 
-        # Create document chain
-        document_chain = create_stuff_documents_chain(self.llm, prompt)
-
-        # Create retrieval chain
-        retriever = self.vector_store.as_retriever(search_kwargs={"k": self.k})
-        qa_chain = create_retrieval_chain(retriever, document_chain)
-
-        return qa_chain
+        return create_stuff_documents_chain(self.llm, prompt)
 
     def answer_question(self, question: str) -> Dict[str, Any]:
         """
@@ -85,20 +99,42 @@ class QARetriever:
         Returns:
             Dictionary with 'answer', 'sources', and 'context' keys
         """
-        # Use QA chain
-        result = self.qa_chain.invoke({"input": question})
+        # Reuse the answer to a near-identical earlier question
+        question_vector = None
+        if self.cache is not None:
+            question_vector = self.vector_store.embeddings.embed_query(question)
+            cached = self.cache.lookup(question_vector)
+            if cached is not None:
+                return cached
+
+        # Retrieve context, reusing the question embedding when we have one
+        if question_vector is not None:
+            source_docs = self.vector_store.similarity_search_by_vector(
+                question_vector, k=self.k
+            )
+        else:
+            source_docs = self.retriever.invoke(question)
+        answer = self.document_chain.invoke({"input": question, "context": source_docs})
 
         # Extract sources from retrieved documents
-        source_docs = result.get("context", [])
+        # One pass, keeping sources in retrieval (relevance) order
         sources = list(
-            set([doc.metadata.get("source", "Unknown") for doc in source_docs])
+            dict.fromkeys(doc.metadata.get("source", "Unknown") for doc in source_docs)
         )
 
-        return {
-            "answer": result.get("answer", ""),
+        response = {
+            "answer": answer,
             "sources": sources,
             "context": source_docs,
         }
+        if self.cache is not None:
+            self.cache.add(question_vector, response)
+        return response
+
+    def clear_cache(self) -> None:
+        """Forget cached answers, e.g. after the documents were reindexed."""
+        if self.cache is not None:
+            self.cache.clear()
 
     def format_response(self, result: Dict[str, Any], show_context: bool = True) -> str:
         """
@@ -139,10 +175,9 @@ class QARetriever:
                     f"\n[Chunk {i} from {doc.metadata.get('source', 'Unknown')}]"
                 )
                 output.append("-" * 60)
-                # Truncate long chunks
+                # Truncate long chunks, copying at most 300 characters
                 content = doc.page_content
-                if len(content) > 300:
-                    content = content[:300] + "..."
-                output.append(content)
+                snippet = content[:300]
+                output.append(snippet + "..." if len(content) > 300 else snippet)
 
         return "\n".join(output)
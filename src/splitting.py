@@ -0,0 +1,134 @@
+"""Single-pass text splitter used when the Rust splitter is unavailable."""
+
+from bisect import bisect_right
+from typing import Callable, List, Optional, Sequence
+from langchain_core.documents import Document
+
+
+class BoundaryTextSplitter:
+    """
+    Split text into chunks at the coarsest separator that fits.
+
+    The text is scanned once from left to right. Each chunk end is found
+    with a bounded reverse search for the preferred separator inside the
+    chunk window, instead of recursively re-splitting the whole text for
+    every separator and merging the pieces back together.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        separators: Sequence[str] = ("\n\n", "\n", " "),
+        offsets_function: Optional[Callable[[str], Sequence[int]]] = None,
+    ):
+        """
+        Initialize the splitter.
+
+        Args:
+            chunk_size: Maximum chunk length in units (characters by default)
+            chunk_overlap: Number of units shared by consecutive chunks
+            separators: Separators in order of preference; text is cut at a
+                fixed position when none of them fits
+            offsets_function: Maps a text to the sorted start offset of each
+                unit, e.g. of each token. None measures in characters.
+        """
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.offsets_function = offsets_function
+        self._separators = [sep for sep in separators if sep]
+
+    @staticmethod
+    def _advance(offsets: Optional[Sequence[int]], n: int, pos: int, units: int) -> int:
+        """Return the character position `units` units after pos."""
+        if offsets is None:
+            return min(pos + units, n)
+        i = bisect_right(offsets, pos) - 1 + units
+        return offsets[i] if i < len(offsets) else n
+
+    @staticmethod
+    def _retreat(offsets: Optional[Sequence[int]], pos: int, units: int) -> int:
+        """Return the character position `units` units before pos."""
+        if offsets is None:
+            return pos - units
+        return offsets[max(bisect_right(offsets, pos - 1) - units, 0)]
+
+    def _last_boundary(self, text: str, floor: int, limit: int) -> int:
+        """Return the end of the last preferred separator starting in text[floor:limit]."""
+        for sep in self._separators:
+            # A separator right at the limit still ends the chunk; it is stripped
+            i = text.rfind(sep, floor, limit + len(sep))
+            if i != -1:
+                return i + len(sep)
+        return limit
+
+    def _first_boundary(self, text: str, floor: int, limit: int) -> int:
+        """Return the end of the first separator of any kind in text[floor:limit]."""
+        first = limit
+        for sep in self._separators:
+            i = text.find(sep, max(floor - len(sep), 0), limit)
+            if i != -1 and floor <= i + len(sep) < first:
+                first = i + len(sep)
+        return first
+
+    def split_text(self, text: str) -> List[str]:
+        """
+        Split a text into chunks.
+
+        Args:
+            text: Text to split
+
+        Returns:
+            List of stripped, non-empty chunks
+        """
+        n = len(text)
+        offsets = self.offsets_function(text) if self.offsets_function else None
+        chunks = []
+        start = prev_end = 0
+        while start < n:
+            limit = self._advance(offsets, n, start, self.chunk_size)
+            if limit >= n:
+                end = n
+            else:
+                # Each chunk must reach past the previous one to make progress
+                end = self._last_boundary(text, max(start, prev_end), limit)
+
+            raw = text[start:end]
+            chunk = raw.strip()
+            if chunk:
+                chunks.append(chunk)
+            if end >= n:
+                break
+
+            # Step back by the overlap, snapping forward to the next boundary
+            # (or cutting mid-word when the overlap window has none)
+            next_start = end
+            if self.chunk_overlap:
+                content_end = start + len(raw.rstrip())
+                back = self._retreat(offsets, content_end, self.chunk_overlap)
+                back = max(back, start + 1)
+                next_start = self._first_boundary(text, back, end)
+                if next_start == end:
+                    next_start = back
+            start, prev_end = next_start, end
+
+        return chunks
+
+    def split_documents(self, documents: List[Document]) -> List[Document]:
+        """
+        Split documents into chunks, copying each document's metadata.
+
+        Args:
+            documents: List of Document objects to split
+
+        Returns:
+            List of chunked Document objects
+        """
+        return [
+            Document(page_content=chunk, metadata=dict(doc.metadata))
+            for doc in documents
+            for chunk in self.split_text(doc.page_content)
+        ]
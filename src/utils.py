@@ -1,13 +1,19 @@
 """Utility functions for the AI agent."""
 
 import os
+import re
 from pathlib import Path
 
+# KEY=value lines; comment lines and lines without '=' don't match
+_ENV_RE = re.compile(r"^[ \t]*([^#=\s][^=\n]*)=(.*)$", re.M)
+
 
 def load_env_file(env_path: str = ".env") -> None:
     """
     Load environment variables from a .env file.
 
+    Variables already set in the environment take precedence over the file.
+
     Args:
         env_path: Path to the .env file
     """
@@ -15,12 +21,9 @@ def load_env_file(env_path: str = ".env") -> None:
     if not env_path.exists():
         return
 
-    with open(env_path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                os.environ[key.strip()] = value.strip()
+    text = env_path.read_text()
+    for match in _ENV_RE.finditer(text):
+        os.environ.setdefault(match.group(1).strip(), match.group(2).strip())
 
 
 def validate_folder(folder_path: str) -> bool:
@@ -0,0 +1,74 @@
+"""Tests for the persistent embedding cache."""
+
+from typing import List
+from langchain_core.embeddings import Embeddings
+import numpy as np
+import pytest
+
+from src.embed_cache import CachedEmbeddings
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic embeddings that count how many texts they embed."""
+
+    def __init__(self, model: str, size: int):
+        self.model = model
+        self.size = size
+        self.calls = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += len(texts)
+        return [[float(len(text) % 7 + i) for i in range(self.size)] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+TEXT = "Shipments are consolidated at the regional hub before final delivery. " * 10
+
+
+def test_exact_hits_skip_the_model(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = FakeEmbeddings("model-a", 8)
+    CachedEmbeddings(first, path).embed_documents([TEXT, TEXT])
+    assert first.calls == 1
+
+    second = FakeEmbeddings("model-a", 8)
+    vectors = CachedEmbeddings(second, path).embed_documents([TEXT])
+    assert second.calls == 0
+    assert len(vectors[0]) == 8
+
+
+def test_near_duplicates_reuse_vectors_of_the_same_model(tmp_path):
+    path = str(tmp_path / "cache.db")
+    CachedEmbeddings(FakeEmbeddings("model-a", 8), path).embed_documents([TEXT])
+
+    model = FakeEmbeddings("model-a", 8)
+    CachedEmbeddings(model, path).embed_documents([TEXT + " "])
+    assert model.calls == 0
+
+
+def test_vectors_of_another_model_are_never_reused(tmp_path):
+    path = str(tmp_path / "cache.db")
+    CachedEmbeddings(FakeEmbeddings("model-a", 16), path).embed_documents([TEXT])
+
+    other = FakeEmbeddings("model-b", 4)
+    cached = CachedEmbeddings(other, path)
+    vectors = cached.embed_documents([TEXT, TEXT + " ", "A different chunk."])
+    assert other.calls == 3
+    assert {len(vector) for vector in vectors} == {4}
+
+    # The entries written for model-b hold model-b vectors
+    assert {len(vector) for vector in cached.embed_documents([TEXT])} == {4}
+
+
+def test_mixed_dimensions_are_rejected(tmp_path):
+    path = str(tmp_path / "cache.db")
+    model = FakeEmbeddings("model-a", 4)
+    cached = CachedEmbeddings(model, path, fuzzy_threshold=None)
+    # A corrupted entry with the wrong dimension
+    key = cached.cache.key("model-a", TEXT)
+    cached.cache.put_many({key: np.zeros(16, dtype=np.float16)})
+
+    with pytest.raises(ValueError, match="mixed dimensions"):
+        cached.embed_documents([TEXT, "A different chunk."])
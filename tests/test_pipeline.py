@@ -0,0 +1,174 @@
+"""Tests for incremental folder indexing and its manifest."""
+
+from typing import Dict, Iterable, List
+from langchain_core.documents import Document
+import os
+
+from src.manifest import diff_manifest, file_signature, load_manifest, manifest_path
+from src.pipeline import index_folder
+
+
+class FakeIndexer:
+    """Indexer that splits on blank lines and keeps chunks in a dict."""
+
+    def __init__(self, persist_directory: str, chunk_size: int = 100):
+        self.persist_directory = persist_directory
+        self.index_settings = {
+            "chunk_size": chunk_size,
+            "chunk_overlap": 0,
+            "embedding_model": "fake",
+        }
+        self.store: Dict[str, str] = {}
+        self.resets = 0
+
+    def split_documents(self, documents: List[Document]) -> List[Document]:
+        chunks, counters = [], {}
+        for doc in documents:
+            source = doc.metadata["source"]
+            for part in doc.page_content.split("\n\n"):
+                index = counters.get(source, 0)
+                counters[source] = index + 1
+                chunk = Document(page_content=part, metadata=dict(doc.metadata))
+                chunk.id = f"{source}:{index}"
+                chunks.append(chunk)
+        return chunks
+
+    def index_chunk_batches(
+        self, batches: Iterable[List[Document]], collection_name: str = "documents"
+    ) -> Dict[str, str]:
+        for batch in batches:
+            for chunk in batch:
+                self.store[chunk.id] = chunk.page_content
+        return self.store
+
+    def delete_chunks(self, ids: List[str], collection_name: str = "documents"):
+        for chunk_id in ids:
+            del self.store[chunk_id]
+
+    def reset_collection(self, collection_name: str = "documents") -> None:
+        self.store.clear()
+        self.resets += 1
+
+    def load_existing_index(self, collection_name: str = "documents"):
+        return self.store
+
+
+def write(path, text: str, mtime_ns: int = None) -> None:
+    """Write a file, optionally forcing its modification time."""
+    path.write_text(text, encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def make_docs(tmp_path):
+    docs = tmp_path / "docs"
+    (docs / "sub").mkdir(parents=True)
+    write(docs / "a.txt", "alpha one\n\nalpha two")
+    write(docs / "sub" / "b.txt", "beta")
+    return docs
+
+
+def run(docs, indexer, **kwargs):
+    return index_folder(str(docs), indexer, loader_workers=1, **kwargs)
+
+
+def test_first_run_indexes_everything_and_records_the_manifest(tmp_path):
+    docs = make_docs(tmp_path)
+    indexer = FakeIndexer(str(tmp_path / "db"))
+
+    store = run(docs, indexer)
+
+    assert sorted(store.values()) == ["alpha one", "alpha two", "beta"]
+    manifest = load_manifest(manifest_path(indexer.persist_directory))
+    assert manifest["settings"] == indexer.index_settings
+    a_path = str(docs / "a.txt")
+    assert manifest["files"][a_path]["ids"] == [f"{a_path}:0", f"{a_path}:1"]
+
+
+def test_unchanged_files_are_skipped(tmp_path, capsys):
+    docs = make_docs(tmp_path)
+    indexer = FakeIndexer(str(tmp_path / "db"))
+    run(docs, indexer)
+    capsys.readouterr()
+
+    store = run(docs, FakeIndexer(indexer.persist_directory))
+
+    assert "All documents are up to date." in capsys.readouterr().out
+    assert store == {}  # Nothing reset, nothing reloaded
+
+
+def test_modified_and_removed_files_replace_their_chunks(tmp_path):
+    docs = make_docs(tmp_path)
+    indexer = FakeIndexer(str(tmp_path / "db"))
+    run(docs, indexer)
+
+    write(docs / "a.txt", "alpha new", mtime_ns=1_000_000_000)
+    (docs / "sub" / "b.txt").unlink()
+    run(docs, indexer)
+
+    assert sorted(indexer.store.values()) == ["alpha new"]
+    files = load_manifest(manifest_path(indexer.persist_directory))["files"]
+    assert list(files) == [str(docs / "a.txt")]
+    assert indexer.resets == 1
+
+
+def test_changed_settings_rebuild_the_index(tmp_path):
+    docs = make_docs(tmp_path)
+    db = str(tmp_path / "db")
+    run(docs, FakeIndexer(db, chunk_size=100))
+
+    indexer = FakeIndexer(db, chunk_size=60)
+    indexer.store["stale"] = "left over"
+    run(docs, indexer)
+
+    assert indexer.resets == 1
+    assert sorted(indexer.store.values()) == ["alpha one", "alpha two", "beta"]
+    settings = load_manifest(manifest_path(db))["settings"]
+    assert settings["chunk_size"] == 60
+
+
+def test_rebuild_reindexes_unchanged_files(tmp_path):
+    docs = make_docs(tmp_path)
+    db = str(tmp_path / "db")
+    run(docs, FakeIndexer(db))
+
+    indexer = FakeIndexer(db)
+    run(docs, indexer, rebuild=True)
+
+    assert indexer.resets == 1
+    assert len(indexer.store) == 3
+
+
+def test_relative_root(tmp_path, monkeypatch):
+    docs = make_docs(tmp_path)
+    monkeypatch.chdir(docs)
+    indexer = FakeIndexer(str(tmp_path / "db"))
+
+    run(".", indexer)
+    run(".", indexer)
+
+    files = load_manifest(manifest_path(indexer.persist_directory))["files"]
+    assert sorted(files) == ["a.txt", os.path.join("sub", "b.txt")]
+    assert sorted(indexer.store) == ["a.txt:0", "a.txt:1", "sub/b.txt:0"]
+
+
+def test_empty_folder_returns_none(tmp_path):
+    (tmp_path / "docs").mkdir()
+    assert run(tmp_path / "docs", FakeIndexer(str(tmp_path / "db"))) is None
+
+
+def test_diff_manifest(tmp_path):
+    kept, edited, added = (tmp_path / name for name in ("kept", "edited", "added"))
+    for path in (kept, edited, added):
+        write(path, "text", mtime_ns=1_000_000_000)
+    mtime, size = file_signature(str(kept))
+    files = {
+        str(kept): {"mtime": mtime, "size": size, "ids": []},
+        str(edited): {"mtime": mtime, "size": size + 1, "ids": []},
+        str(tmp_path / "gone"): {"mtime": mtime, "size": size, "ids": []},
+    }
+
+    changed, removed = diff_manifest(files, [str(kept), str(edited), str(added)])
+
+    assert changed == [str(edited), str(added)]
+    assert removed == [str(tmp_path / "gone")]
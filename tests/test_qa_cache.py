@@ -0,0 +1,53 @@
+"""Tests for the semantic answer cache."""
+
+from langchain_core.documents import Document
+
+from src.qa_cache import ResponseCache
+
+
+def result(answer: str):
+    return {
+        "answer": answer,
+        "sources": ["faq.pdf"],
+        "context": [Document(page_content="context", metadata={"source": "faq.pdf"})],
+    }
+
+
+def test_similar_questions_hit_and_persist(tmp_path):
+    path = str(tmp_path / "qa.db")
+    cache = ResponseCache(path, settings={"k": 4})
+    cache.add([1.0, 0.0, 0.0], result("yes"))
+
+    assert cache.lookup([0.99, 0.01, 0.0])["answer"] == "yes"
+    assert cache.lookup([0.0, 1.0, 0.0]) is None
+
+    reopened = ResponseCache(path, settings={"k": 4})
+    hit = reopened.lookup([1.0, 0.0, 0.0])
+    assert hit["context"][0].metadata == {"source": "faq.pdf"}
+
+
+def test_other_settings_miss(tmp_path):
+    path = str(tmp_path / "qa.db")
+    ResponseCache(path, settings={"k": 4}).add([1.0, 0.0], result("yes"))
+
+    assert ResponseCache(path, settings={"k": 6}).lookup([1.0, 0.0]) is None
+
+
+def test_pruning_keeps_other_settings(tmp_path):
+    path = str(tmp_path / "qa.db")
+    other = ResponseCache(path, settings={"k": 6})
+    other.add([0.0, 1.0], result("kept"))
+
+    cache = ResponseCache(path, settings={"k": 4}, max_entries=1)
+    cache.add([1.0, 0.0], result("old"))
+    cache.add([1.0, 1.0], result("new"))
+
+    assert ResponseCache(path, settings={"k": 6}).lookup([0.0, 1.0])["answer"] == "kept"
+    assert cache.lookup([1.0, 0.0]) is None
+
+
+def test_clear(tmp_path):
+    cache = ResponseCache(str(tmp_path / "qa.db"))
+    cache.add([1.0, 0.0], result("yes"))
+    cache.clear()
+    assert cache.lookup([1.0, 0.0]) is None
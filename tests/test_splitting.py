@@ -0,0 +1,63 @@
+"""Tests for the pure-Python fallback splitter."""
+
+import re
+import pytest
+from langchain_core.documents import Document
+
+from src.splitting import BoundaryTextSplitter
+
+
+def word_offsets(text: str):
+    """Treat each word (with its leading whitespace) as one unit."""
+    return [0] + [m.start() for m in re.finditer(r"\s+\S", text) if m.start() > 0]
+
+
+def test_prefers_paragraph_breaks():
+    text = "first paragraph here\n\nsecond paragraph here"
+    splitter = BoundaryTextSplitter(chunk_size=30, chunk_overlap=0)
+    chunks = splitter.split_text(text)
+    assert chunks == ["first paragraph here", "second paragraph here"]
+
+
+def test_chunks_respect_size_and_cover_the_text():
+    words = [f"word{i}" for i in range(200)]
+    splitter = BoundaryTextSplitter(chunk_size=50, chunk_overlap=0)
+    chunks = splitter.split_text(" ".join(words))
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    assert " ".join(chunks).split() == words
+
+
+def test_overlap_repeats_the_tail_of_the_previous_chunk():
+    text = " ".join(f"w{i:02d}" for i in range(40))
+    splitter = BoundaryTextSplitter(chunk_size=40, chunk_overlap=12)
+    chunks = splitter.split_text(text)
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.split()[0] in previous.split()
+
+
+def test_text_without_separators_is_cut_at_the_size():
+    splitter = BoundaryTextSplitter(chunk_size=10, chunk_overlap=0)
+    assert splitter.split_text("x" * 25) == ["x" * 10, "x" * 10, "x" * 5]
+
+
+def test_sizes_measured_in_units_from_offsets_function():
+    text = " ".join(f"token{i}" for i in range(10))
+    splitter = BoundaryTextSplitter(
+        chunk_size=4, chunk_overlap=0, offsets_function=word_offsets
+    )
+    chunks = splitter.split_text(text)
+    assert [len(chunk.split()) for chunk in chunks] == [4, 4, 2]
+
+
+def test_split_documents_copies_metadata():
+    splitter = BoundaryTextSplitter(chunk_size=10, chunk_overlap=0)
+    doc = Document(page_content="aaaa bbbb cccc", metadata={"source": "a.txt"})
+    chunks = splitter.split_documents([doc])
+    assert len(chunks) == 2
+    assert all(chunk.metadata == {"source": "a.txt"} for chunk in chunks)
+    assert chunks[0].metadata is not doc.metadata
+
+
+def test_overlap_must_be_smaller_than_size():
+    with pytest.raises(ValueError):
+        BoundaryTextSplitter(chunk_size=10, chunk_overlap=10)